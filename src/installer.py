@@ -1,30 +1,10 @@
 from pathlib import Path
-from enum import Enum
 
 import typer
 
-from utils import (
-    build_install_command,
-    command_exists,
-    detect_os,
-    detect_package_manager,
-    get_vscode_settings_path,
-    merge_json_file,
-    run_command,
-    write_file,
-)
-
 app = typer.Typer(help="Cross-platform dev environment enabler CLI")
 
 
-class Profile(str, Enum):
-    base = "base"
-    python = "python"
-    web = "web"
-    java = "java"
-    cpp = "cpp"
-    fullstack = "fullstack"
-
 PROFILE_TO_COMPONENTS: dict[str, list[str]] = {
     "base": ["vscode", "python", "node", "java", "cpp"],
     "python": ["vscode", "python"],
@@ -34,6 +14,9 @@ PROFILE_TO_COMPONENTS: dict[str, list[str]] = {
     "fullstack": ["vscode", "python", "node", "java", "cpp"],
 }
 
+PROFILE_NAMES = tuple(PROFILE_TO_COMPONENTS.keys())
+_PROFILE_METAVAR = f"[{'|'.join(PROFILE_NAMES)}]"
+
 PACKAGE_MAP: dict[str, dict[str, str]] = {
     "vscode": {
         "winget": "Microsoft.VisualStudioCode",
@@ -103,6 +86,12 @@ PACKAGE_MAP: dict[str, dict[str, str]] = {
     },
 }
 
+_PACKAGE_INDEX: dict[tuple[str, str], str] = {
+    (component, package_manager): package_name
+    for component, manager_map in PACKAGE_MAP.items()
+    for package_manager, package_name in manager_map.items()
+}
+
 PROFILE_EXTENSIONS: dict[str, list[str]] = {
     "base": [
         "ms-python.python",
@@ -141,20 +130,42 @@ DEFAULT_SETTINGS = {
 }
 
 
-def _profile_components(profile: str) -> list[str]:
+PY_APP_PY: bytes = b"def main():\n    print(\"Hello from Python starter\")\n\n\nif __name__ == '__main__':\n    main()\n"
+PY_REQS: bytes = b"pytest\n"
+PY_README: bytes = b"# Python Starter\n\nRun: `python app.py`\n"
+NODE_PKG_JSON: bytes = b'{\n  "name": "node-starter",\n  "version": "1.0.0",\n  "private": true,\n  "type": "module",\n  "scripts": {\n    "start": "node src/index.js"\n  }\n}\n'
+NODE_INDEX_JS: bytes = b"console.log('Hello from Node.js starter');\n"
+JAVA_POM: bytes = b"""<project xmlns=\"http://maven.apache.org/POM/4.0.0\"\n         xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\"\n         xsi:schemaLocation=\"http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd\">\n  <modelVersion>4.0.0</modelVersion>\n  <groupId>dev.enabler</groupId>\n  <artifactId>java-starter</artifactId>\n  <version>1.0.0</version>\n  <properties>\n    <maven.compiler.source>21</maven.compiler.source>\n    <maven.compiler.target>21</maven.compiler.target>\n  </properties>\n</project>\n"""
+JAVA_APP: bytes = b"public class App {\n    public static void main(String[] args) {\n        System.out.println(\"Hello from Java starter\");\n    }\n}\n"
+CPP_MAIN: bytes = b"#include <iostream>\n\nint main() {\n    std::cout << \"Hello from C++ starter\\n\";\n    return 0;\n}\n"
+CPP_CMAKE: bytes = b"cmake_minimum_required(VERSION 3.16)\nproject(cpp_starter)\nset(CMAKE_CXX_STANDARD 17)\nadd_executable(cpp_starter main.cpp)\n"
+
+
+_RESOLVED_PROFILES: dict[str, tuple[str, ...]] = {
+    name: tuple(components + (["cmake"] if "cpp" in components and "cmake" not in components else []))
+    for name, components in PROFILE_TO_COMPONENTS.items()
+}
+
+_RESOLVED_PROFILE_SETS: dict[str, frozenset[str]] = {
+    name: frozenset(components) for name, components in _RESOLVED_PROFILES.items()
+}
+
+
+def _complete_profile(incomplete: str) -> list[str]:
+    return [name for name in PROFILE_NAMES if name.startswith(incomplete)]
+
+
+def _validate_profile(profile: str) -> str:
     if profile not in PROFILE_TO_COMPONENTS:
-        raise typer.BadParameter(
-            f"Unknown profile '{profile}'. Choose one of: {', '.join(PROFILE_TO_COMPONENTS.keys())}"
-        )
-    components = PROFILE_TO_COMPONENTS[profile][:]
-    if "cpp" in components and "cmake" not in components:
-        components.append("cmake")
-    return components
+        raise typer.BadParameter(f"Unknown profile '{profile}'. Choose one of: {', '.join(PROFILE_NAMES)}")
+    return profile
+
 
+def _install_components(components: tuple[str, ...], dry_run: bool = False) -> None:
+    from utils import BATCH_INSTALL_MANAGERS, detect_os, detect_package_manager
 
-def _install_components(profile: str, dry_run: bool = False) -> None:
     os_name = detect_os()
-    package_manager = detect_package_manager(os_name)
+    package_manager = detect_package_manager(os_name, persist=not dry_run)
     if package_manager is None:
         typer.echo("No supported package manager found on this machine.")
         raise typer.Exit(code=1)
@@ -162,89 +173,111 @@ def _install_components(profile: str, dry_run: bool = False) -> None:
     typer.echo(f"Detected OS: {os_name}")
     typer.echo(f"Using package manager: {package_manager}")
 
-    for component in _profile_components(profile):
-        package_name = PACKAGE_MAP.get(component, {}).get(package_manager)
+    resolved = [(component, _PACKAGE_INDEX.get((component, package_manager))) for component in components]
+    for component, package_name in resolved:
         if not package_name:
             typer.echo(f"Skipping {component}: no package mapping for {package_manager}")
-            continue
+    to_install = [(component, package_name) for component, package_name in resolved if package_name]
+
+    if not to_install:
+        return
+
+    batched = package_manager in BATCH_INSTALL_MANAGERS and len(to_install) > 1
+    if batched:
+        if _run_install(package_manager, to_install, dry_run):
+            return
+        typer.echo("Batch install failed; retrying each package individually.")
+
+    failed = [component for component, package_name in to_install if not _run_install(package_manager, [(component, package_name)], dry_run)]
+    if failed:
+        typer.echo(f"Failed to install: {', '.join(failed)}")
 
-        install_command = build_install_command(package_manager, package_name)
-        typer.echo(f"Installing {component}: {' '.join(install_command)}")
-        run_command(install_command, dry_run=dry_run)
+
+def _run_install(package_manager: str, batch: list[tuple[str, str]], dry_run: bool) -> bool:
+    from utils import build_install_command, run_command
+
+    install_command = build_install_command(package_manager, [package_name for _, package_name in batch])
+    typer.echo(f"Installing {', '.join(component for component, _ in batch)}: {' '.join(install_command)}")
+    result = run_command(install_command, dry_run=dry_run)
+    return result is None or result.returncode == 0
 
 
 def _install_vscode_extensions(profile: str, dry_run: bool = False) -> None:
-    if not command_exists("code"):
+    import shutil
+
+    from utils import run_command
+
+    if shutil.which("code") is None:
         typer.echo("VS Code CLI not found. Ensure 'code' is in PATH before extension setup.")
         return
 
     extensions = PROFILE_EXTENSIONS.get(profile, [])
+    if not extensions:
+        return
+
+    command = ["code"]
     for extension in extensions:
-        command = ["code", "--install-extension", extension, "--force"]
         typer.echo(f"Installing VS Code extension: {extension}")
-        run_command(command, dry_run=dry_run)
+        command += ["--install-extension", extension]
+    command.append("--force")
+    run_command(command, dry_run=dry_run)
 
 
 def _configure_vscode_settings() -> None:
+    from utils import get_vscode_settings_path, merge_json_file
+
     settings_path = get_vscode_settings_path()
-    merge_json_file(settings_path, DEFAULT_SETTINGS)
-    typer.echo(f"Updated VS Code settings: {settings_path}")
-
-
-def _create_python_sample(project_root: Path) -> None:
-    write_file(
-        project_root / "python-app" / "app.py",
-        "def main():\n    print(\"Hello from Python starter\")\n\n\nif __name__ == '__main__':\n    main()\n",
-    )
-    write_file(project_root / "python-app" / "requirements.txt", "pytest\n")
-    write_file(project_root / "python-app" / "README.md", "# Python Starter\n\nRun: `python app.py`\n")
-
-
-def _create_node_sample(project_root: Path) -> None:
-    write_file(
-        project_root / "node-app" / "package.json",
-        '{\n  "name": "node-starter",\n  "version": "1.0.0",\n  "private": true,\n  "type": "module",\n  "scripts": {\n    "start": "node src/index.js"\n  }\n}\n',
-    )
-    write_file(
-        project_root / "node-app" / "src" / "index.js",
-        "console.log('Hello from Node.js starter');\n",
-    )
-
-
-def _create_java_sample(project_root: Path) -> None:
-    write_file(
-        project_root / "java-app" / "pom.xml",
-        """<project xmlns=\"http://maven.apache.org/POM/4.0.0\"\n         xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\"\n         xsi:schemaLocation=\"http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd\">\n  <modelVersion>4.0.0</modelVersion>\n  <groupId>dev.enabler</groupId>\n  <artifactId>java-starter</artifactId>\n  <version>1.0.0</version>\n  <properties>\n    <maven.compiler.source>21</maven.compiler.source>\n    <maven.compiler.target>21</maven.compiler.target>\n  </properties>\n</project>\n""",
-    )
-    write_file(
-        project_root / "java-app" / "src" / "main" / "java" / "App.java",
-        "public class App {\n    public static void main(String[] args) {\n        System.out.println(\"Hello from Java starter\");\n    }\n}\n",
-    )
-
-
-def _create_cpp_sample(project_root: Path) -> None:
-    write_file(
-        project_root / "cpp-app" / "main.cpp",
-        "#include <iostream>\n\nint main() {\n    std::cout << \"Hello from C++ starter\\n\";\n    return 0;\n}\n",
-    )
-    write_file(
-        project_root / "cpp-app" / "CMakeLists.txt",
-        "cmake_minimum_required(VERSION 3.16)\nproject(cpp_starter)\nset(CMAKE_CXX_STANDARD 17)\nadd_executable(cpp_starter main.cpp)\n",
-    )
-
-
-def _generate_samples(target_dir: Path, profile: str) -> None:
+    if merge_json_file(settings_path, DEFAULT_SETTINGS):
+        typer.echo(f"Updated VS Code settings: {settings_path}")
+    else:
+        typer.echo(f"VS Code settings already up to date: {settings_path}")
+
+
+def _create_python_sample(project_root: Path) -> list[tuple[Path, bytes]]:
+    return [
+        (project_root / "python-app" / "app.py", PY_APP_PY),
+        (project_root / "python-app" / "requirements.txt", PY_REQS),
+        (project_root / "python-app" / "README.md", PY_README),
+    ]
+
+
+def _create_node_sample(project_root: Path) -> list[tuple[Path, bytes]]:
+    return [
+        (project_root / "node-app" / "package.json", NODE_PKG_JSON),
+        (project_root / "node-app" / "src" / "index.js", NODE_INDEX_JS),
+    ]
+
+
+def _create_java_sample(project_root: Path) -> list[tuple[Path, bytes]]:
+    return [
+        (project_root / "java-app" / "pom.xml", JAVA_POM),
+        (project_root / "java-app" / "src" / "main" / "java" / "App.java", JAVA_APP),
+    ]
+
+
+def _create_cpp_sample(project_root: Path) -> list[tuple[Path, bytes]]:
+    return [
+        (project_root / "cpp-app" / "main.cpp", CPP_MAIN),
+        (project_root / "cpp-app" / "CMakeLists.txt", CPP_CMAKE),
+    ]
+
+
+def _generate_samples(target_dir: Path, components: frozenset[str]) -> None:
+    from utils import write_files
+
     target_dir.mkdir(parents=True, exist_ok=True)
-    components = _profile_components(profile)
 
+    files: list[tuple[Path, bytes]] = []
     if "python" in components:
-        _create_python_sample(target_dir)
+        files.extend(_create_python_sample(target_dir))
     if "node" in components:
-        _create_node_sample(target_dir)
+        files.extend(_create_node_sample(target_dir))
     if "java" in components:
-        _create_java_sample(target_dir)
+        files.extend(_create_java_sample(target_dir))
     if "cpp" in components:
-        _create_cpp_sample(target_dir)
+        files.extend(_create_cpp_sample(target_dir))
+
+    write_files(files)
 
     typer.echo(f"Sample projects generated under: {target_dir}")
 
@@ -258,52 +291,75 @@ def list_profiles() -> None:
 
 @app.command("install")
 def install(
-    profile: Profile = typer.Option(Profile.fullstack, help="Environment profile to install"),
+    profile: str = typer.Option(
+        "fullstack",
+        help="Environment profile to install",
+        metavar=_PROFILE_METAVAR,
+        callback=_validate_profile,
+        autocompletion=_complete_profile,
+    ),
     dry_run: bool = typer.Option(False, help="Print commands without executing"),
 ) -> None:
-    _install_components(profile.value, dry_run=dry_run)
+    _install_components(_RESOLVED_PROFILES[profile], dry_run=dry_run)
 
 
 @app.command("configure-vscode")
 def configure_vscode(
-    profile: Profile = typer.Option(Profile.fullstack, help="Profile to select extension set"),
+    profile: str = typer.Option(
+        "fullstack",
+        help="Profile to select extension set",
+        metavar=_PROFILE_METAVAR,
+        callback=_validate_profile,
+        autocompletion=_complete_profile,
+    ),
     dry_run: bool = typer.Option(False, help="Print extension commands without executing"),
 ) -> None:
-    _install_vscode_extensions(profile.value, dry_run=dry_run)
+    _install_vscode_extensions(profile, dry_run=dry_run)
     if not dry_run:
         _configure_vscode_settings()
 
 
 @app.command("init-samples")
 def init_samples(
-    profile: Profile = typer.Option(Profile.fullstack, help="Profile that determines sample projects"),
+    profile: str = typer.Option(
+        "fullstack",
+        help="Profile that determines sample projects",
+        metavar=_PROFILE_METAVAR,
+        callback=_validate_profile,
+        autocompletion=_complete_profile,
+    ),
     output_dir: str = typer.Option("sample-projects", help="Directory to create sample projects in"),
 ) -> None:
-    _generate_samples(Path(output_dir), profile.value)
+    _generate_samples(Path(output_dir), _RESOLVED_PROFILE_SETS[profile])
 
 
 @app.command("setup")
 def setup(
-    profile: Profile = typer.Option(Profile.fullstack, help="Environment profile to apply"),
+    profile: str = typer.Option(
+        "fullstack",
+        help="Environment profile to apply",
+        metavar=_PROFILE_METAVAR,
+        callback=_validate_profile,
+        autocompletion=_complete_profile,
+    ),
     output_dir: str = typer.Option("sample-projects", help="Directory to create sample projects in"),
     dry_run: bool = typer.Option(False, help="Print commands without executing install/configure steps"),
     skip_install: bool = typer.Option(False, help="Skip package installations"),
     skip_vscode: bool = typer.Option(False, help="Skip VS Code setup"),
     skip_samples: bool = typer.Option(False, help="Skip sample project generation"),
 ) -> None:
-    profile_name = profile.value
-    typer.echo(f"Applying profile: {profile_name}")
+    typer.echo(f"Applying profile: {profile}")
 
     if not skip_install:
-        _install_components(profile_name, dry_run=dry_run)
+        _install_components(_RESOLVED_PROFILES[profile], dry_run=dry_run)
 
     if not skip_vscode:
-        _install_vscode_extensions(profile_name, dry_run=dry_run)
+        _install_vscode_extensions(profile, dry_run=dry_run)
         if not dry_run:
             _configure_vscode_settings()
 
     if not skip_samples:
-        _generate_samples(Path(output_dir), profile_name)
+        _generate_samples(Path(output_dir), _RESOLVED_PROFILE_SETS[profile])
 
     typer.echo("Setup complete.")
 
@@ -1,19 +1,56 @@
-import json
+import functools
 import os
-import platform
-import shutil
-import subprocess
+import sys
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    import subprocess
+
+_HOME = Path.home()
+
+
+def _config_dir() -> Path:
+    return _HOME / ".config" / "dev_environment_enabler"
+
 
 def get_config_path() -> str:
-    home_dir = Path.home()
-    config_dir = home_dir / ".config" / "dev_environment_enabler"
+    config_dir = _config_dir()
     config_dir.mkdir(parents=True, exist_ok=True)
     return str(config_dir / "config.json")
 
 
+def _os_cache_path() -> Path:
+    return _config_dir() / "os_cache.json"
+
+
+def _read_os_cache() -> dict[str, Any]:
+    import json
+
+    try:
+        with _os_cache_path().open("r", encoding="utf-8") as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+
+def _write_os_cache(os_name: str, package_manager: str, manager_path: str) -> None:
+    import json
+
+    cache_path = _os_cache_path()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with cache_path.open("w", encoding="utf-8") as cache_file:
+            json.dump({"os": os_name, "package_manager": package_manager, "path": manager_path}, cache_file, indent=2)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
 def detect_os() -> str:
+    import platform
+
     os_name = platform.system().lower()
     if os_name == "darwin":
         return "macos"
@@ -22,8 +59,40 @@ def detect_os() -> str:
     return "linux"
 
 
+@functools.lru_cache(maxsize=1)
+def _path_executables() -> dict[str, str]:
+    is_windows = os.name == "nt"
+    path_exts = {ext.lower() for ext in os.environ.get("PATHEXT", "").split(os.pathsep) if ext} if is_windows else set()
+
+    executables: dict[str, str] = {}
+    for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not directory:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if is_windows:
+                        stem, ext = os.path.splitext(entry.name.lower())
+                        if ext in path_exts:
+                            executables.setdefault(stem, entry.path)
+                    else:
+                        executables.setdefault(entry.name, entry.path)
+        except OSError:
+            continue
+    return executables
+
+
+def _find_on_path(command: str) -> str | None:
+    if os.name == "nt":
+        command = command.lower()
+    command_path = _path_executables().get(command)
+    if command_path is None or not os.path.isfile(command_path) or not os.access(command_path, os.X_OK):
+        return None
+    return command_path
+
+
 def command_exists(command: str) -> bool:
-    return shutil.which(command) is not None
+    return _find_on_path(command) is not None
 
 
 def run_command(
@@ -32,82 +101,210 @@ def run_command(
     check: bool = False,
     dry_run: bool = False,
     capture_output: bool = False,
-) -> subprocess.CompletedProcess[str] | None:
+) -> "subprocess.CompletedProcess[Any] | None":
     if dry_run:
         return None
 
+    import shutil
+    import subprocess
+
+    if sys.platform == "win32":
+        executable = None
+        close_fds = True
+    else:
+        executable = shutil.which(command[0]) or command[0]
+        close_fds = False
+
     return subprocess.run(
         command,
+        executable=executable,
         check=check,
-        text=True,
+        stdin=subprocess.DEVNULL,
+        close_fds=close_fds,
+        text=capture_output,
         capture_output=capture_output,
     )
 
 
-def detect_package_manager(os_name: str) -> str | None:
-    if os_name == "windows":
-        for manager in ["winget", "choco", "scoop"]:
-            if command_exists(manager):
-                return manager
+OS_RELEASE_PACKAGE_MANAGERS: dict[str, tuple[str, ...]] = {
+    "debian": ("apt",),
+    "ubuntu": ("apt",),
+    "fedora": ("dnf", "yum"),
+    "rhel": ("dnf", "yum"),
+    "centos": ("dnf", "yum"),
+    "arch": ("pacman",),
+    "suse": ("zypper",),
+    "opensuse": ("zypper",),
+}
+
+
+def _read_os_release_ids() -> list[str] | None:
+    try:
+        with open("/etc/os-release", encoding="utf-8") as release_file:
+            lines = release_file.read().splitlines()
+    except OSError:
         return None
 
-    if os_name == "macos":
-        return "brew" if command_exists("brew") else None
+    fields: dict[str, str] = {}
+    for line in lines:
+        key, sep, value = line.partition("=")
+        if sep:
+            fields[key.strip()] = value.strip().strip("\"'").lower()
+    return [fields.get("ID", ""), *fields.get("ID_LIKE", "").split()]
+
+
+@functools.lru_cache(maxsize=None)
+def detect_package_manager(os_name: str, persist: bool = True) -> str | None:
+    cached = _read_os_cache()
+    cached_manager = cached.get("package_manager")
+    cached_path = cached.get("path")
+    if (
+        cached.get("os") == os_name
+        and isinstance(cached_manager, str)
+        and isinstance(cached_path, str)
+        and os.path.exists(cached_path)
+    ):
+        return cached_manager
+
+    probed = _probe_package_manager(os_name)
+    if probed is None:
+        return None
+
+    package_manager, manager_path = probed
+    if persist:
+        _write_os_cache(os_name, package_manager, manager_path)
+    return package_manager
 
-    linux_managers = ["apt", "dnf", "yum", "pacman", "zypper"]
-    for manager in linux_managers:
-        if command_exists(manager):
-            return manager
+
+def _first_on_path(managers: list[str]) -> tuple[str, str] | None:
+    for manager in managers:
+        manager_path = _find_on_path(manager)
+        if manager_path is not None:
+            return manager, manager_path
     return None
 
 
-def build_install_command(package_manager: str, package: str) -> list[str]:
-    install_commands = {
-        "winget": ["winget", "install", "--id", package, "--silent", "--accept-source-agreements", "--accept-package-agreements"],
-        "choco": ["choco", "install", package, "-y"],
-        "scoop": ["scoop", "install", package],
-        "brew": ["brew", "install", package],
-        "apt": ["sudo", "apt", "install", "-y", package],
-        "dnf": ["sudo", "dnf", "install", "-y", package],
-        "yum": ["sudo", "yum", "install", "-y", package],
-        "pacman": ["sudo", "pacman", "-S", "--noconfirm", package],
-        "zypper": ["sudo", "zypper", "install", "-y", package],
-    }
-    if package_manager not in install_commands:
+def _probe_package_manager(os_name: str) -> tuple[str, str] | None:
+    if os_name == "windows":
+        return _first_on_path(["winget", "choco", "scoop"])
+
+    if os_name == "macos":
+        return _first_on_path(["brew"])
+
+    release_ids = _read_os_release_ids()
+    if release_ids is not None:
+        for release_id in release_ids:
+            for manager in OS_RELEASE_PACKAGE_MANAGERS.get(release_id, ()):
+                manager_path = f"/usr/bin/{manager}"
+                if os.path.exists(manager_path):
+                    return manager, manager_path
+
+    return _first_on_path(["apt", "dnf", "yum", "pacman", "zypper"])
+
+
+BATCH_INSTALL_MANAGERS = frozenset({"choco", "scoop", "brew", "apt", "dnf", "yum", "pacman", "zypper"})
+
+
+_INSTALL_CMD_TEMPLATES: dict[str, tuple[str, ...]] = {
+    "winget": ("winget", "install", "--id", "{pkg}", "--silent", "--accept-source-agreements", "--accept-package-agreements"),
+    "choco": ("choco", "install", "{pkg}", "-y"),
+    "scoop": ("scoop", "install", "{pkg}"),
+    "brew": ("brew", "install", "{pkg}"),
+    "apt": ("sudo", "apt", "install", "-y", "{pkg}"),
+    "dnf": ("sudo", "dnf", "install", "-y", "{pkg}"),
+    "yum": ("sudo", "yum", "install", "-y", "{pkg}"),
+    "pacman": ("sudo", "pacman", "-S", "--noconfirm", "{pkg}"),
+    "zypper": ("sudo", "zypper", "install", "-y", "{pkg}"),
+}
+
+_INSTALL_CMD_PARTS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    manager: (template[: template.index("{pkg}")], template[template.index("{pkg}") + 1 :])
+    for manager, template in _INSTALL_CMD_TEMPLATES.items()
+}
+
+
+def build_install_command(package_manager: str, packages: list[str]) -> list[str]:
+    parts = _INSTALL_CMD_PARTS.get(package_manager)
+    if parts is None:
         raise ValueError(f"Unsupported package manager: {package_manager}")
-    return install_commands[package_manager]
+    if len(packages) > 1 and package_manager not in BATCH_INSTALL_MANAGERS:
+        raise ValueError(f"{package_manager} cannot install several packages in one command")
+    prefix, suffix = parts
+    return [*prefix, *packages, *suffix]
 
 
+@functools.lru_cache(maxsize=None)
 def get_vscode_settings_path() -> Path:
-    os_name = detect_os()
-    home = Path.home()
-    if os_name == "windows":
-        app_data = os.environ.get("APPDATA", str(home / "AppData" / "Roaming"))
+    if sys.platform == "win32":
+        app_data = os.environ.get("APPDATA", str(_HOME / "AppData" / "Roaming"))
         return Path(app_data) / "Code" / "User" / "settings.json"
-    if os_name == "macos":
-        return home / "Library" / "Application Support" / "Code" / "User" / "settings.json"
-    return home / ".config" / "Code" / "User" / "settings.json"
+    if sys.platform == "darwin":
+        return _HOME / "Library" / "Application Support" / "Code" / "User" / "settings.json"
+    return _HOME / ".config" / "Code" / "User" / "settings.json"
+
 
+def _json_codec() -> tuple[Callable[[bytes], Any], Callable[[Any], bytes]]:
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.loads, lambda data: json.dumps(data, indent=2).encode("utf-8")
+    return orjson.loads, lambda data: orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+
+def merge_json_file(file_path: Path, update_payload: dict[str, Any]) -> bool:
+    loads, dumps = _json_codec()
+
+    try:
+        existing_bytes: bytes | None = file_path.read_bytes()
+    except FileNotFoundError:
+        existing_bytes = None
+
+    current_data: dict[str, Any] = {}
+    if existing_bytes is not None:
+        try:
+            current_data = loads(existing_bytes)
+        except ValueError:
+            current_data = {}
+
+    if existing_bytes is not None and all(
+        key in current_data and current_data[key] == value for key, value in update_payload.items()
+    ):
+        return False
 
-def merge_json_file(file_path: Path, update_payload: dict[str, Any]) -> None:
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    if file_path.exists():
-        with file_path.open("r", encoding="utf-8") as existing_file:
-            try:
-                current_data = json.load(existing_file)
-            except json.JSONDecodeError:
-                current_data = {}
-    else:
-        current_data = {}
+    file_path.write_bytes(dumps({**current_data, **update_payload}))
+    return True
+
 
-    current_data.update(update_payload)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
 
-    with file_path.open("w", encoding="utf-8") as output_file:
-        json.dump(current_data, output_file, indent=2)
 
+def _write_contents(file_path: Path, content: bytes | str, overwrite: bool) -> None:
+    flags = _WRITE_FLAGS | (os.O_TRUNC if overwrite else os.O_EXCL)
+    try:
+        fd = os.open(file_path, flags, 0o644)
+    except FileExistsError:
+        return
+
+    with os.fdopen(fd, "wb") as output_file:
+        output_file.write(content if isinstance(content, bytes) else content.encode("utf-8"))
 
-def write_file(file_path: Path, content: str, overwrite: bool = False) -> None:
+
+def write_file(file_path: Path, content: bytes | str, overwrite: bool = False) -> None:
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    if file_path.exists() and not overwrite:
+    _write_contents(file_path, content, overwrite)
+
+
+def write_files(files: list[tuple[Path, bytes]] | list[tuple[Path, str]], overwrite: bool = False) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not files:
         return
-    file_path.write_text(content, encoding="utf-8")
\ No newline at end of file
+
+    for directory in {file_path.parent for file_path, _ in files}:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        list(executor.map(lambda item: _write_contents(item[0], item[1], overwrite), files))
\ No newline at end of file